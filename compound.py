@@ -154,7 +154,7 @@ def update_bot_order_volumes(
             f"made by '{bot_name}'\nChanged BO from ₿{round(base_order_volume, rounddigits)} to "
             f"₿{round(new_base_order_volume, rounddigits)}\nChanged SO from "
             f"₿{round(safety_order_volume, rounddigits)} to ₿{round(new_safety_order_volume, rounddigits)}",
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
@@ -438,10 +438,10 @@ def compound_bot(cfg, thebot):
         else:
             logger.info(
                 f"{bot_name}\nNo (new) profit made, no BO/SO value updates needed!",
-                True,
+                notify=True,
             )
     else:
-        logger.info(f"{bot_name}\nNo (new) deals found for this bot!", True)
+        logger.info(f"{bot_name}\nNo (new) deals found for this bot!", notify=True)
 
 
 def init_compound_db():
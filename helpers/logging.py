@@ -172,37 +172,43 @@ class Logger:
         else:
             self.info("Notifications are disabled")
 
-    def log(self, message, level="info"):
+    def log(self, message, level="info", *args):
         """Call the log levels."""
         if level == "info":
-            self.my_logger.info(message)
+            self.my_logger.info(message, *args)
         elif level == "warning":
-            self.my_logger.warning(message)
+            self.my_logger.warning(message, *args)
         elif level == "error":
-            self.my_logger.error(message)
+            self.my_logger.error(message, *args)
         elif level == "debug":
-            self.my_logger.debug(message)
+            self.my_logger.debug(message, *args)
 
-    def info(self, message, notify=False):
+    def queue_notification(self, message, *args):
+        """Queue the formatted message for notification."""
+        self.notificationhandler.queue_notification(
+            message % args if args else message
+        )
+
+    def info(self, message, *args, notify=False):
         """Info level."""
-        self.log(message, "info")
+        self.log(message, "info", *args)
         if self.notify_enabled and notify:
-            self.notificationhandler.queue_notification(message)
+            self.queue_notification(message, *args)
 
-    def warning(self, message, notify=True):
+    def warning(self, message, *args, notify=True):
         """Warning level."""
-        self.log(message, "warning")
+        self.log(message, "warning", *args)
         if self.notify_enabled and notify:
-            self.notificationhandler.queue_notification(message)
+            self.queue_notification(message, *args)
 
-    def error(self, message, notify=True):
+    def error(self, message, *args, notify=True):
         """Error level."""
-        self.log(message, "error")
+        self.log(message, "error", *args)
         if self.notify_enabled and notify:
-            self.notificationhandler.queue_notification(message)
+            self.queue_notification(message, *args)
 
-    def debug(self, message, notify=False):
+    def debug(self, message, *args, notify=False):
         """Debug level."""
-        self.log(message, "debug")
+        self.log(message, "debug", *args)
         if self.notify_enabled and notify:
-            self.notificationhandler.queue_notification(message)
+            self.queue_notification(message, *args)
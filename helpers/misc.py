@@ -13,7 +13,7 @@ def wait_time_interval(logger, notification, time_interval):
         nexttime = localtime + int(time_interval)
         timeresult = time.strftime("%H:%M:%S", time.localtime(nexttime))
         logger.info(
-            "Next update in %s Seconds at %s" % (time_interval, timeresult), True
+            "Next update in %s Seconds at %s" % (time_interval, timeresult), notify=True
         )
         notification.send_notification()
         time.sleep(time_interval)
@@ -255,7 +255,7 @@ def set_threecommas_bot_pairs(logger, api, thebot, newpairs):
         logger.info(
             "Bot '%s' with id '%s' is already using the best pairs"
             % (thebot["name"], thebot["id"]),
-            True,
+            notify=True,
         )
         return
 
@@ -293,19 +293,19 @@ def set_threecommas_bot_pairs(logger, api, thebot, newpairs):
         logger.info(
             "Bot '%s' with id '%s' updated with %d pairs (%s ... %s)"
             % (thebot["name"], thebot["id"], len(newpairs), newpairs[0], newpairs[-1]),
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
             logger.error(
                 "Error occurred while updating bot '%s' error: %s"
                 % (thebot["name"], error["msg"]),
-                True,
+                notify=True,
             )
         else:
             logger.error(
                 "Error occurred while updating bot '%s'" % thebot["name"],
-                True,
+                notify=True,
             )
 
 def set_threecommas_bot_pairs_macs(logger, api, thebot, newpairs, maxpairs):
@@ -345,7 +345,7 @@ def set_threecommas_bot_pairs_macs(logger, api, thebot, newpairs, maxpairs):
         logger.info(
             "Bot '%s' with id '%s' is already using the best pairs"
             % (thebot["name"], thebot["id"]),
-            True,
+            notify=True,
         )
         if not thebot['is_enabled']:
             error, data = api.request(
@@ -389,7 +389,7 @@ def set_threecommas_bot_pairs_macs(logger, api, thebot, newpairs, maxpairs):
         logger.info(
             "Bot '%s' with id '%s' updated with %d pairs (%s ... %s)"
             % (thebot["name"], thebot["id"], len(newpairs), newpairs[0], newpairs[-1]),
-            True,
+            notify=True,
         )
         if not thebot['is_enabled']:
             error, data = api.request(
@@ -404,12 +404,12 @@ def set_threecommas_bot_pairs_macs(logger, api, thebot, newpairs, maxpairs):
             logger.error(
                 "Error occurred while updating bot '%s' error: %s"
                 % (thebot["name"], error["msg"]),
-                True,
+                notify=True,
             )
         else:
             logger.error(
                 "Error occurred while updating bot '%s'" % thebot["name"],
-                True,
+                notify=True,
             )
 
 
@@ -427,7 +427,7 @@ def trigger_threecommas_bot_deal(logger, api, thebot, pair, skip_checks=False):
         logger.info(
             "Bot '%s' with id '%s' triggered start_new_deal for: %s"
             % (thebot["name"], thebot["id"], pair),
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
@@ -459,7 +459,7 @@ def control_threecommas_bot(logger, api, thebot, cmd):
         logger.debug("Bot enabled or disabled: %s" % data)
         logger.info(
             "Bot '%s' is set to '%s'" % (thebot["name"], action),
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
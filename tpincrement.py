@@ -76,7 +76,7 @@ def update_deal(thebot, deal, to_increment, new_percentage):
         logger.info(
             f"Incremented TP for deal {deal_id}/{deal['pair']} and bot \"{bot_name}\"\n"
             f"Changed TP from {deal['take_profit']}% to {new_percentage}% (+{to_increment}%)",
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
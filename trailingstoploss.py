@@ -74,7 +74,7 @@ def update_deal(thebot, deal, new_stoploss):
         logger.info(
             f"Changing SL for deal {deal_id}/{deal['pair']} on bot \"{bot_name}\"\n"
             f"Changed SL from {deal['stop_loss_percentage']}% to {new_stoploss}% - current profit = {deal['actual_profit_percentage']}%",
-            True,
+            notify=True,
         )
     else:
         if error and "msg" in error:
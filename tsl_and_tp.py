@@ -4,21 +4,49 @@ import argparse
 import configparser
 import json
 import os
+import random
 import sqlite3
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import List
 
 from helpers.logging import Logger, NotificationHandler
-from helpers.misc import check_deal, wait_time_interval
+from helpers.misc import wait_time_interval
 from helpers.threecommas import init_threecommas_api
 
 
-def load_config():
-    """Create default or load existing config file."""
+@dataclass
+class Settings:
+    """Settings from the config file, converted once per (re)load."""
+
+    botids: List[int]
+    check_interval: int
+    monitor_interval: int
+    activation_percentage: float
+    initial_stoploss_percentage: float
+    tp_increment_factor: float
+
+
+def load_config(force=False):
+    """Create default or load existing config file, reparse it only when changed."""
+    global config_mtime, config_cache
+
+    # Return the cached config unless the file has been modified, or reload is forced
+    try:
+        mtime = os.stat(f"{datadir}/{program}.ini").st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    if not force and mtime is not None and mtime == config_mtime:
+        return config_cache
 
     cfg = configparser.ConfigParser()
     if cfg.read(f"{datadir}/{program}.ini"):
+        config_mtime = mtime
+        config_cache = cfg
         return cfg
 
     cfg["settings"] = {
@@ -43,6 +71,52 @@ def load_config():
     return None
 
 
+def load_settings(cfg):
+    """Convert the settings used while processing deals."""
+
+    check_interval = cfg.getint("settings", "check-interval")
+    monitor_interval = cfg.getint("settings", "monitor-interval")
+    if check_interval < 30 or monitor_interval < 30:
+        logger.warning(
+            "Intervals below 30 seconds are not recommended, using 30 seconds instead"
+        )
+
+    return Settings(
+        botids=json.loads(cfg.get("settings", "botids")),
+        check_interval=max(check_interval, 30),
+        monitor_interval=max(monitor_interval, 30),
+        activation_percentage=cfg.getfloat("settings", "activation-percentage"),
+        initial_stoploss_percentage=cfg.getfloat(
+            "settings", "initial-stoploss-percentage"
+        ),
+        tp_increment_factor=cfg.getfloat("settings", "tp-increment-factor"),
+    )
+
+
+def to_basis_points(percentage):
+    """Convert a percentage (number or string) to integer basis points."""
+
+    return round(float(percentage) * 100)
+
+
+def is_deal_changed(deal, new_stoploss, new_take_profit):
+    """Check if new SL/TP differ from the deal, to skip no-op updates."""
+
+    changed = to_basis_points(deal["stop_loss_percentage"]) != to_basis_points(
+        new_stoploss
+    ) or to_basis_points(deal["take_profit"]) != to_basis_points(new_take_profit)
+
+    if not changed:
+        logger.debug(
+            "Deal %s already has SL %s%% and TP %s%%, no update required",
+            deal["id"],
+            new_stoploss,
+            new_take_profit,
+        )
+
+    return changed
+
+
 def update_deal(thebot, deal, new_stoploss, new_take_profit):
     """Update bot with new SL."""
     bot_name = thebot["name"]
@@ -60,15 +134,22 @@ def update_deal(thebot, deal, new_stoploss, new_take_profit):
     )
     if data:
         logger.info(
-            f"Changing SL for deal {deal_id}/{deal['pair']} on bot \"{bot_name}\"\n"
-            f"Changed SL from {deal['stop_loss_percentage']}% to {new_stoploss}%. "
-            f"Changed TP from {deal['take_profit']}% to {new_take_profit}",
-            True,
+            "Changing SL for deal %s/%s on bot \"%s\"\n"
+            "Changed SL from %s%% to %s%%. "
+            "Changed TP from %s%% to %s",
+            deal_id,
+            deal["pair"],
+            bot_name,
+            deal["stop_loss_percentage"],
+            new_stoploss,
+            deal["take_profit"],
+            new_take_profit,
+            notify=True,
         )
     else:
         if error and "msg" in error:
             logger.error(
-                "Error occurred updating bot with new SL/TP values: %s" % error["msg"]
+                "Error occurred updating bot with new SL/TP values: %s", error["msg"]
             )
         else:
             logger.error("Error occurred updating bot with new SL/TP valuess")
@@ -82,113 +163,197 @@ def process_deals(thebot):
 
     if deals:
         botid = thebot["id"]
-        current_deals = ""
+        current_deals = []
+        new_deals = []
+        changed_deals = []
+
+        # Fetch the stored deals of this bot at once instead of per deal
+        existing_deals = {
+            row["dealid"]: row
+            for row in cursor.execute(
+                "SELECT * FROM deals WHERE botid = ?", (botid,)
+            )
+        }
+
+        # All SL/TP arithmetic is done in integer basis points (0.01%)
+        activation_bp = to_basis_points(settings.activation_percentage)
+        initial_stoploss_bp = to_basis_points(settings.initial_stoploss_percentage)
 
         for deal in deals:
             deal_id = deal["id"]
+            current_deals.append(deal_id)
 
-            if current_deals:
-                current_deals += ","
-            current_deals += str(deal_id)
-
-            actual_profit_percentage = float(deal["actual_profit_percentage"])
-            existing_deal = check_deal(cursor, deal_id)
+            actual_profit_bp = to_basis_points(deal["actual_profit_percentage"])
+            actual_profit_percentage = actual_profit_bp / 100
+            existing_deal = existing_deals.get(deal_id)
 
-            if not existing_deal and actual_profit_percentage >= activation_percentage:
-                monitored_deals = +1
+            if not existing_deal and actual_profit_bp >= activation_bp:
+                monitored_deals += 1
 
                 # New deal which requires TSL
-                activation_diff = actual_profit_percentage - activation_percentage
-                new_stoploss = 0.0 - round(
-                    initial_stoploss_percentage + (activation_diff), 2
-                )
+                activation_diff_bp = actual_profit_bp - activation_bp
+                new_stoploss = (0 - initial_stoploss_bp - activation_diff_bp) / 100
 
                 # Increase TP using diff multiplied with the configured factor
-                new_take_profit = round(
-                    float(deal["take_profit"])
-                    + (activation_diff * tp_increment_factor),
-                    2,
-                )
+                new_take_profit = (
+                    to_basis_points(deal["take_profit"])
+                    + round(activation_diff_bp * settings.tp_increment_factor)
+                ) / 100
 
-                update_deal(thebot, deal, new_stoploss, new_take_profit)
+                if is_deal_changed(deal, new_stoploss, new_take_profit):
+                    update_deal(thebot, deal, new_stoploss, new_take_profit)
 
-                db.execute(
-                    f"INSERT INTO deals (dealid, botid, last_profit_percentage, last_stop_loss_percentage) "
-                    f"VALUES ({deal_id}, {botid}, {actual_profit_percentage}, {new_stoploss})"
+                new_deals.append(
+                    (deal_id, botid, actual_profit_percentage, new_stoploss)
                 )
                 logger.info(
-                    f"New deal found {deal_id}/{deal['pair']} on bot \"{thebot['name']}\"; "
-                    f"current profit {actual_profit_percentage}, stoploss set to {new_stoploss} "
-                    f"and tp to {new_take_profit}"
+                    "New deal found %s/%s on bot \"%s\"; "
+                    "current profit %s, stoploss set to %s and tp to %s",
+                    deal_id,
+                    deal["pair"],
+                    thebot["name"],
+                    actual_profit_percentage,
+                    new_stoploss,
+                    new_take_profit,
                 )
             elif existing_deal:
-                monitored_deals = +1
-                last_profit_percentage = float(existing_deal["last_profit_percentage"])
-
-                if actual_profit_percentage > last_profit_percentage:
-                    monitored_deals = +1
+                monitored_deals += 1
+                last_profit_bp = to_basis_points(
+                    existing_deal["last_profit_percentage"]
+                )
+                last_profit_percentage = last_profit_bp / 100
 
+                if actual_profit_bp > last_profit_bp:
                     # Existing deal with TSL and profit increased, so move TSL
-                    actual_stoploss = float(deal["stop_loss_percentage"])
-                    actual_take_profit = float(deal["take_profit"])
-                    profit_diff = actual_profit_percentage - last_profit_percentage
+                    profit_diff_bp = actual_profit_bp - last_profit_bp
 
                     logger.info(
-                        f"Deal {deal_id} profit change from {last_profit_percentage}% to "
-                        f"{actual_profit_percentage}%. Keep on monitoring."
+                        "Deal %s profit change from %s%% to %s%%. Keep on monitoring.",
+                        deal_id,
+                        last_profit_percentage,
+                        actual_profit_percentage,
                     )
 
-                    new_stoploss = round(actual_stoploss - profit_diff, 2)
-                    new_take_profit = round(
-                        actual_take_profit + (profit_diff * tp_increment_factor), 2
-                    )
+                    new_stoploss = (
+                        to_basis_points(deal["stop_loss_percentage"]) - profit_diff_bp
+                    ) / 100
+                    new_take_profit = (
+                        to_basis_points(deal["take_profit"])
+                        + round(profit_diff_bp * settings.tp_increment_factor)
+                    ) / 100
 
                     update_deal(thebot, deal, new_stoploss, new_take_profit)
 
-                    db.execute(
-                        f"UPDATE deals SET last_profit_percentage = {actual_profit_percentage}, "
-                        f"last_stop_loss_percentage = {new_stoploss} "
-                        f"WHERE dealid = {deal_id}"
+                    changed_deals.append(
+                        (actual_profit_percentage, new_stoploss, deal_id)
                     )
                 else:
                     logger.info(
-                        f"Deal {deal_id} no profit increase (current: {actual_profit_percentage}%, "
-                        f"last: {last_profit_percentage}%. Keep on monitoring."
+                        "Deal %s no profit increase (current: %s%%, "
+                        "last: %s%%. Keep on monitoring.",
+                        deal_id,
+                        actual_profit_percentage,
+                        last_profit_percentage,
                     )
 
         logger.info(
-            f"Finished processing {len(deals)} deals for bot \"{thebot['name']}\""
+            "Finished processing %s deals for bot \"%s\"", len(deals), thebot["name"]
         )
 
         # Housekeeping, clean things up and prevent endless growing database
-        if current_deals:
-            logger.info(f"Deleting old deals from bot {botid} except {current_deals}")
+        logger.info(
+            "Deleting old deals from bot %s except %s",
+            botid,
+            ",".join(map(str, current_deals)),
+        )
+
+        # Write all deal changes of this bot in a single transaction, the
+        # connection is in autocommit mode so begin and end it explicitly
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.executemany(
+                "INSERT INTO deals (dealid, botid, last_profit_percentage, last_stop_loss_percentage) "
+                "VALUES (?, ?, ?, ?)",
+                new_deals,
+            )
+            cursor.executemany(
+                "UPDATE deals SET last_profit_percentage = ?, "
+                "last_stop_loss_percentage = ? "
+                "WHERE dealid = ?",
+                changed_deals,
+            )
+            db.execute("DELETE FROM current_deals")
+            cursor.executemany(
+                "INSERT INTO current_deals (dealid) VALUES (?)",
+                [(dealid,) for dealid in current_deals],
+            )
             db.execute(
-                f"DELETE FROM deals WHERE botid = {botid} AND dealid NOT IN ({current_deals})"
+                "DELETE FROM deals WHERE botid = ? AND dealid NOT IN "
+                "(SELECT dealid FROM current_deals)",
+                (botid,),
             )
-
-        db.commit()
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            db.execute("ROLLBACK")
+            raise
 
         logger.info(
-            f"Bot {botid} has {len(deals)} of which {monitored_deals} deal(s) require monitoring."
+            "Bot %s has %s of which %s deal(s) require monitoring.",
+            botid,
+            len(deals),
+            monitored_deals,
         )
     # No else, no deals for this bot
 
     return monitored_deals
 
 
+def fetch_bot(botid):
+    """Fetch bot with its active deals, bot data itself is reused for 5 minutes."""
+
+    cached = bot_cache.get(botid)
+    if cached and time.time() - cached[0] < 300:
+        error, data = api.request(
+            entity="deals",
+            action="",
+            payload={
+                "scope": "active",
+                "bot_id": str(botid),
+                "limit": 1000,
+            },
+        )
+        if error:
+            return error, None
+
+        return None, {**cached[1], "active_deals": data}
+
+    error, data = api.request(
+        entity="bots",
+        action="show",
+        action_id=str(botid),
+    )
+    if data:
+        bot_cache[botid] = (time.time(), data)
+
+    return error, data
+
+
 def init_tsl_db():
     """Create or open database to store bot and deals data."""
     try:
         dbname = f"{program}.sqlite3"
         dbpath = f"file:{datadir}/{dbname}?mode=rw"
-        dbconnection = sqlite3.connect(dbpath, uri=True)
+        dbconnection = sqlite3.connect(
+            dbpath, uri=True, cached_statements=128, isolation_level=None
+        )
         dbconnection.row_factory = sqlite3.Row
 
         logger.info(f"Database '{datadir}/{dbname}' opened successfully")
 
     except sqlite3.OperationalError:
-        dbconnection = sqlite3.connect(f"{datadir}/{dbname}")
+        dbconnection = sqlite3.connect(
+            f"{datadir}/{dbname}", cached_statements=128, isolation_level=None
+        )
         dbconnection.row_factory = sqlite3.Row
         dbcursor = dbconnection.cursor()
         logger.info(f"Database '{datadir}/{dbname}' created successfully")
@@ -198,6 +363,15 @@ def init_tsl_db():
         )
         logger.info("Database tables created successfully")
 
+    dbconnection.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=67108864;"
+        "CREATE INDEX IF NOT EXISTS deals_botid ON deals (botid);"
+        "CREATE TEMP TABLE current_deals (dealid INT Primary Key);"
+    )
+
     return dbconnection
 
 
@@ -215,6 +389,8 @@ else:
     datadir = os.getcwd()
 
 # Create or load configuration file
+config_mtime = None
+config_cache = None
 config = load_config()
 if not config:
     # Initialise temp logging
@@ -257,44 +433,61 @@ api = init_threecommas_api(config)
 db = init_tsl_db()
 cursor = db.cursor()
 
+# Bot data by bot id, with the time it was fetched
+bot_cache = {}
+
 # TrailingStopLoss and TakeProfit %
+settings_config = None
+error_streak = 0
 while True:
 
     config = load_config()
-    logger.info(f"Reloaded configuration from '{datadir}/{program}.ini'")
-
-    # Configuration settings
-    botids = json.loads(config.get("settings", "botids"))
-    check_interval = int(config.get("settings", "check-interval"))
-    monitor_interval = int(config.get("settings", "monitor-interval"))
-    activation_percentage = float(
-        json.loads(config.get("settings", "activation-percentage"))
-    )
-    initial_stoploss_percentage = float(
-        json.loads(config.get("settings", "initial-stoploss-percentage"))
-    )
-    tp_increment_factor = float(
-        json.loads(config.get("settings", "tp-increment-factor"))
-    )
+
+    # Configuration settings, only converted again when the file has changed
+    if config is not settings_config:
+        settings_config = config
+        logger.info(f"Reloaded configuration from '{datadir}/{program}.ini'")
+
+        settings = load_settings(config)
 
     deals_to_monitor = 0
+    bot_errors = 0
+
+    # Fetch all bots configured in parallel, but process them one by one
+    # so the database is only written from this thread
+    workers = max(1, min(8, len(settings.botids)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch_bot, bot) for bot in settings.botids]
+        for future in as_completed(futures):
+            boterror, botdata = future.result()
+            if botdata:
+                deals_to_monitor += process_deals(botdata)
+            else:
+                bot_errors += 1
+                if boterror and "msg" in boterror:
+                    logger.error("Error occurred updating bots: %s" % boterror["msg"])
+                else:
+                    logger.error("Error occurred updating bots")
+
+    timeint = (
+        settings.check_interval if deals_to_monitor == 0 else settings.monitor_interval
+    )
 
-    # Walk through all bots configured
-    for bot in botids:
-        boterror, botdata = api.request(
-            entity="bots",
-            action="show",
-            action_id=str(bot),
+    # Back off exponentially (with jitter) while none of the bots can be fetched
+    if settings.botids and bot_errors == len(settings.botids):
+        error_streak += 1
+        timeint = min(
+            max(600, settings.check_interval),
+            settings.check_interval * 2 ** error_streak,
+        ) + random.randint(0, 5)
+        logger.warning(
+            "Fetching bots failed %s time(s) in a row, backing off",
+            error_streak,
+            notify=False,
         )
-        if botdata:
-            deals_to_monitor += process_deals(botdata)
-        else:
-            if boterror and "msg" in boterror:
-                logger.error("Error occurred updating bots: %s" % boterror["msg"])
-            else:
-                logger.error("Error occurred updating bots")
+    else:
+        error_streak = 0
 
-    timeint = check_interval if deals_to_monitor == 0 else monitor_interval
     if not wait_time_interval(logger, notification, timeint):
         break
 
@@ -79,7 +79,7 @@ def watchlist_deal(thebot, coin):
     # Check if pair is on 3Commas blacklist
     if pair in blacklist:
         logger.debug(
-            "This pair is on your 3Commas blacklist and was skipped: %s" % pair, True
+            "This pair is on your 3Commas blacklist and was skipped: %s" % pair, notify=True
         )
         return
 
@@ -87,7 +87,7 @@ def watchlist_deal(thebot, coin):
     if pair not in thebot["pairs"]:
         logger.debug(
             "This pair is not in bot's pairlist, and was skipped: %s" % pair,
-            True,
+            notify=True,
         )
         return
 
@@ -165,7 +165,7 @@ async def callback(event):
     """Parse Telegram message."""
     logger.info(
         "Received telegram message: '%s'" % event.message.text.replace("\n", " - "),
-        True,
+        notify=True,
     )
 
     trigger = event.raw_text.splitlines()
@@ -233,6 +233,6 @@ client.start()
 logger.info(
     "Listening to telegram chat '%s' for triggers"
     % config.get("settings", "tgram-channel"),
-    True,
+    notify=True,
 )
 client.run_until_disconnected()
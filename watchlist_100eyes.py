@@ -91,7 +91,7 @@ def watchlist_100eyes_deal(thebot, base, coin):
     # Check if pair is on 3Commas blacklist
     if pair in blacklist:
         logger.debug(
-            "This pair is on your 3Commas blacklist and was skipped: %s" % pair, True
+            "This pair is on your 3Commas blacklist and was skipped: %s" % pair, notify=True
         )
         return
 
@@ -99,7 +99,7 @@ def watchlist_100eyes_deal(thebot, base, coin):
     if pair not in thebot["pairs"]:
         logger.debug(
             "This pair is not in bot's pairlist, and was skipped: %s" % pair,
-            True,
+            notify=True,
         )
         return
 
@@ -203,7 +203,7 @@ async def callback(event):
     """Parse Telegram message."""
     logger.info(
         "Received telegram message: '%s'" % event.message.text.replace("\n", " - "),
-        True,
+        notify=True,
     )
 
     # Get message from telegram
@@ -269,6 +269,6 @@ client.start()
 logger.info(
     "Listening to telegram chat '%s' for triggers"
     % config.get("settings", "tgram-channel"),
-    True,
+    notify=True,
 )
 client.run_until_disconnected()